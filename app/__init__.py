@@ -1,11 +1,30 @@
 # app/__init__.py
 from flask import Flask
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+class ORJSONProvider(DefaultJSONProvider):
+    """JSON provider backed by orjson; Flask's default goes through the
+    much slower stdlib json for every jsonify call"""
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=self.default).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
 def create_app():
     """Application factory pattern"""
     app = Flask(__name__)
-    
+
+    if orjson is not None:
+        app.json = ORJSONProvider(app)
+
     # Enable CORS
     CORS(app)
 
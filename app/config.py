@@ -1,20 +1,24 @@
 # config.py
 
 MAX_TEXT_LENGTH = 2000
-MIN_TEXT_LENGTH = 30 
-SAFETY_CHECK_RATIO = 0.3 
+MIN_TEXT_LENGTH = 30
+SAFETY_CHECK_RATIO = 0.3
+MAX_BATCH_SIZE = 50
 
 # Model Configuration
 MODEL_REPO = "shanndrea/indot5-small-medical-simplifier"
 MODEL_MAX_LENGTH = 256
 MODEL_MIN_LENGTH = 20
-MODEL_NUM_BEAMS = 5
+MODEL_NUM_BEAMS = 4
 MODEL_REPETITION_PENALTY = 1.5
 MODEL_NO_REPEAT_NGRAM_SIZE = 3
 MODEL_TEMPERATURE = 0.7
 MODEL_TOP_K = 50
 MODEL_TOP_P = 0.95
 MODEL_MAX_NEW_TOKENS = 128
+MODEL_INT8_QUANTIZATION = True  # dynamic int8 for CPU inference only
+MODEL_USE_ONNX = True  # try ONNX Runtime on CPU when optimum is installed
+SIMPLIFY_CACHE_SIZE = 1024
 
 # Server Configuration
 SERVER_HOST = '0.0.0.0'
@@ -26,6 +30,7 @@ DICTIONARY_PATH = "data/dictionary.csv"
 
 # Health Check
 HEALTH_CHECK_TEXT = "Pasien memiliki penyakit hipertensi dan anemia"
+HEALTH_CACHE_TTL = 60
 
 # Logging Configuration
 LOG_LEVEL = "INFO"
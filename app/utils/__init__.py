@@ -3,5 +3,5 @@ from .error_handler import (
     AppError, ValidationError, ModelError, MedicalTermError,
     create_error_response, create_success_response
 )
-from .post_processor import post_processor, get_simplification_mapping, detect_recognized_terms
+from .post_processor import get_post_processor, get_simplification_mapping, detect_recognized_terms
 from .text_cleaner import final_cleanup
\ No newline at end of file
@@ -1,9 +1,26 @@
-from flask import jsonify
+from flask import g, jsonify
 from datetime import datetime
 import logging
 
 logger = logging.getLogger(__name__)
 
+def _request_timestamp():
+    """ISO timestamp computed at most once per request.
+
+    A handler may build several payloads (validation retries, error
+    fallbacks); caching on flask.g avoids a datetime allocation and
+    ISO formatting for each one.
+    """
+    try:
+        timestamp = getattr(g, 'request_time_iso', None)
+        if timestamp is None:
+            timestamp = datetime.utcnow().isoformat()
+            g.request_time_iso = timestamp
+        return timestamp
+    except RuntimeError:
+        # Outside an application context (direct calls from scripts/tests)
+        return datetime.utcnow().isoformat()
+
 class AppError(Exception):
     """Base application error class"""
     def __init__(self, message, status_code=400, error_code=None, details=None):
@@ -36,7 +53,7 @@ def create_error_response(message, status_code=400, error_code=None, details=Non
             'code': error_code or 'UNKNOWN_ERROR',
             'message': message,
             'details': details,
-            'timestamp': datetime.utcnow().isoformat()
+            'timestamp': _request_timestamp()
         }
     }
     return jsonify(error_payload), status_code
@@ -47,7 +64,7 @@ def create_success_response(data=None, message=None, status_code=200):
         'status': 'success',
         'data': data,
         'message': message,
-        'timestamp': datetime.utcnow().isoformat()
+        'timestamp': _request_timestamp()
     }
     return jsonify(response), status_code
 
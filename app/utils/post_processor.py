@@ -1,77 +1,220 @@
-import pandas as pd
+import csv
 import re
 import os
-import traceback
+import pickle
 import logging
+from functools import cache, lru_cache
 from app.config import DICTIONARY_PATH
 
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
 logger = logging.getLogger(__name__)
 
+def _is_word_boundary(text, start, end):
+    """Check that a match at text[start:end] is not embedded in a larger word"""
+    if start > 0 and text[start - 1].isalnum():
+        return False
+    if end < len(text) and text[end].isalnum():
+        return False
+    return True
+
 class DictionaryPostProcessor:
     def __init__(self, dictionary_path=DICTIONARY_PATH):
+        self._source_path = dictionary_path
         self.dictionary = self.load_dictionary(dictionary_path)
-    
-    def load_dictionary(self, path):
-        try:
-            if not os.path.exists(path):
-                logger.error(f"Dictionary file not found: {path}")
-                return {}
-                
-            df = pd.read_csv(path)
-            # Ensure correct columns are used
-            if 'term' in df.columns and 'simplified' in df.columns:
-                dictionary_dict = dict(zip(df['term'], df['simplified']))
-                logger.info(f"Dictionary loaded successfully with {len(dictionary_dict)} entries")
-                return dictionary_dict
-            else:
-                logger.error("Columns 'term' or 'simplified' not found in CSV")
-                logger.error(f"Available columns: {df.columns.tolist()}")
-                return {}
-                
-        except Exception as e:
-            logger.error(f"Failed to load dictionary: {e}")
-            logger.error(traceback.format_exc())
-            return {}
-    
-    def post_process(self, text):
+        # Snapshotting the automatons only makes sense for the dictionary
+        # that came from the CSV, not for ones swapped in afterwards
+        self._csv_dictionary = self.dictionary
+        self._compile_dictionary()
+
+    def _compile_dictionary(self):
+        """Precompile a single combined replacement pattern for the current dictionary"""
+        self._dictionary_ref = self.dictionary
+        self.dictionary_count = len(self.dictionary)
+
         if not self.dictionary:
-            logger.warning("Dictionary is empty, skipping post-processing")
-            return text
-        
-        result = text
+            self._lower_map = {}
+            self._original_key = {}
+            self._combined_re = None
+            self.all_phrases = frozenset()
+            self._phrase_re = None
+            self._phrase_automaton = None
+            self._term_automaton = None
+            return
+
+        self._lower_map = {term.lower(): replacement for term, replacement in self.dictionary.items()}
+        self._original_key = {term.lower(): term for term in self.dictionary}
+        # Memoized on the key set, so equal dictionaries (e.g. rebuilt test
+        # fixtures) share one compiled pattern instead of recompiling
+        self._combined_re = _combined_pattern(frozenset(self._lower_map))
+
+        # Terms plus their replacements, used by /validate-text to accept
+        # both complex and already-simplified phrasing; frozen once so
+        # request handlers never rebuild the union per call
+        self.all_phrases = frozenset(self.dictionary.keys()) | frozenset(self.dictionary.values())
+        phrases = self.all_phrases
+        self._phrase_re = _phrase_pattern(phrases)
+
+        self._phrase_automaton = None
+        self._term_automaton = None
+        if ahocorasick is not None:
+            # Only the CSV-backed dictionary gets a disk snapshot; test code
+            # swapping in ad-hoc dictionaries rebuilds in memory as before
+            snapshot_eligible = self.dictionary is getattr(self, '_csv_dictionary', None)
+
+            if snapshot_eligible:
+                snapshot = self._load_automaton_snapshot()
+                if snapshot is not None:
+                    self._term_automaton, self._phrase_automaton = snapshot
+                    return
+
+            automaton = ahocorasick.Automaton()
+            for phrase in phrases:
+                automaton.add_word(phrase.lower(), phrase)
+            automaton.make_automaton()
+            self._phrase_automaton = automaton
+
+            term_automaton = ahocorasick.Automaton()
+            for term, replacement in self.dictionary.items():
+                lowered_term = term.lower()
+                term_automaton.add_word(lowered_term, (len(lowered_term), replacement))
+            term_automaton.make_automaton()
+            self._term_automaton = term_automaton
+
+            if snapshot_eligible:
+                self._save_automaton_snapshot()
+
+    def _load_automaton_snapshot(self):
+        """Load pickled automatons if they are newer than the source CSV"""
+        snapshot_path = self._source_path + '.ac.pkl'
+        try:
+            if os.path.exists(snapshot_path) and os.path.getmtime(snapshot_path) >= os.path.getmtime(self._source_path):
+                with open(snapshot_path, 'rb') as snapshot_file:
+                    return pickle.load(snapshot_file)
+        except Exception as snapshot_error:
+            logger.warning(f"Automaton snapshot unreadable, rebuilding: {snapshot_error}")
+        return None
+
+    def _save_automaton_snapshot(self):
+        """Persist the built automatons next to the CSV for the next process"""
+        snapshot_path = self._source_path + '.ac.pkl'
+        try:
+            with open(snapshot_path, 'wb') as snapshot_file:
+                pickle.dump(
+                    (self._term_automaton, self._phrase_automaton),
+                    snapshot_file, protocol=pickle.HIGHEST_PROTOCOL
+                )
+        except OSError as snapshot_error:
+            logger.warning(f"Could not write automaton snapshot: {snapshot_error}")
+
+    def _replace_with_automaton(self, text):
+        """Replace dictionary terms in one linear pass over the text"""
+        lowered = text.lower()
+        pieces = []
+        last_end = 0
         replacements_made = 0
-        
-        for term, replacement in self.dictionary.items():
-            pattern = r'\b' + re.escape(term) + r'\b'
-            model_result = result
-            result = re.sub(pattern, replacement, result, flags=re.IGNORECASE)
-            if result != model_result:
-                replacements_made += 1
-        
-        logger.debug(f"Dictionary replacements made: {replacements_made}")
-        return result
-    
-    def __init__(self, dictionary_path=DICTIONARY_PATH):
-        self.dictionary = self.load_dictionary(dictionary_path)
-    
+
+        # iter_long yields the longest non-overlapping matches left to right
+        for end_index, (length, replacement) in self._term_automaton.iter_long(lowered):
+            start = end_index - length + 1
+            if start < last_end or not _is_word_boundary(lowered, start, end_index + 1):
+                continue
+            pieces.append(text[last_end:start])
+            pieces.append(replacement)
+            last_end = end_index + 1
+            replacements_made += 1
+
+        pieces.append(text[last_end:])
+        return ''.join(pieces), replacements_made
+
+    def recognized_terms(self, text):
+        """Collect all dictionary terms present in text in one automaton pass"""
+        if not self.dictionary or not text:
+            return []
+
+        if self.dictionary is not self._dictionary_ref:
+            self._compile_dictionary()
+
+        if self._term_automaton is None:
+            return [term for term in self.dictionary if _term_pattern(term).search(text)]
+
+        lowered = text.lower()
+        found = {}
+        # iter (not iter_long) so nested terms are reported as well,
+        # matching the behaviour of the old per-term search
+        for end_index, (length, _replacement) in self._term_automaton.iter(lowered):
+            start = end_index - length + 1
+            if _is_word_boundary(lowered, start, end_index + 1):
+                found.setdefault(lowered[start:end_index + 1], None)
+
+        return [self._original_key[term] for term in found]
+
+    def contains_medical_phrase(self, text):
+        """Check whether text contains any dictionary term or simplified phrase"""
+        if not self.dictionary or not text:
+            return False
+
+        if self.dictionary is not self._dictionary_ref:
+            self._compile_dictionary()
+
+        if self._phrase_automaton is not None:
+            lowered = text.lower()
+            for end_index, phrase in self._phrase_automaton.iter(lowered):
+                start = end_index - len(phrase) + 1
+                if _is_word_boundary(lowered, start, end_index + 1):
+                    logger.info(f"Validation success: Found term '{phrase}' in input.")
+                    return True
+            return False
+
+        match = self._phrase_re.search(text)
+        if match:
+            logger.info(f"Validation success: Found term '{match.group(0)}' in input.")
+            return True
+        return False
+
     def load_dictionary(self, path):
         """Load dictionary from CSV with correct structure"""
         try:
             if not os.path.exists(path):
                 logger.error(f"Dictionary file not found: {path}")
                 return {}
-                
-            df = pd.read_csv(path)
-            # Ensure correct columns are used
-            if 'term' in df.columns and 'simplified' in df.columns:
-                dictionary_dict = dict(zip(df['term'], df['simplified']))
-                logger.info(f"Dictionary loaded successfully with {len(dictionary_dict)} entries")
-                return dictionary_dict
-            else:
-                logger.error("Columns 'term' or 'simplified' not found in CSV")
-                logger.error(f"Available columns: {df.columns.tolist()}")
-                return {}
-                
+
+            # A pickled snapshot next to the CSV skips re-parsing on every
+            # process start (one per gunicorn worker); mtime-invalidated
+            snapshot_path = path + '.pkl'
+            try:
+                if os.path.exists(snapshot_path) and os.path.getmtime(snapshot_path) >= os.path.getmtime(path):
+                    with open(snapshot_path, 'rb') as snapshot_file:
+                        dictionary_dict = pickle.load(snapshot_file)
+                    logger.info(f"Dictionary loaded from snapshot with {len(dictionary_dict)} entries")
+                    return dictionary_dict
+            except Exception as snapshot_error:
+                logger.warning(f"Dictionary snapshot unreadable, re-parsing CSV: {snapshot_error}")
+
+            with open(path, newline='', encoding='utf-8') as csv_file:
+                reader = csv.DictReader(csv_file)
+                # Ensure correct columns are used
+                if not reader.fieldnames or 'term' not in reader.fieldnames or 'simplified' not in reader.fieldnames:
+                    logger.error("Columns 'term' or 'simplified' not found in CSV")
+                    logger.error(f"Available columns: {reader.fieldnames}")
+                    return {}
+                dictionary_dict = {
+                    row['term']: row['simplified']
+                    for row in reader if row.get('term') and row.get('simplified')
+                }
+
+            try:
+                with open(snapshot_path, 'wb') as snapshot_file:
+                    pickle.dump(dictionary_dict, snapshot_file, protocol=pickle.HIGHEST_PROTOCOL)
+            except OSError as snapshot_error:
+                logger.warning(f"Could not write dictionary snapshot: {snapshot_error}")
+
+            logger.info(f"Dictionary loaded successfully with {len(dictionary_dict)} entries")
+            return dictionary_dict
+
         except Exception as e:
             logger.error(f"Failed to load dictionary: {e}")
             return {}
@@ -81,44 +224,106 @@ class DictionaryPostProcessor:
         if not self.dictionary:
             logger.warning("Dictionary is empty, skipping post-processing")
             return text
-        
-        result = text
-        replacements_made = 0
-        
-        for term, replacement in self.dictionary.items():
-            # Case-insensitive whole word replacement
-            pattern = r'\b' + re.escape(term) + r'\b'
-            model_result = result
-            result = re.sub(pattern, replacement, result, flags=re.IGNORECASE)
-            if result != model_result:
+
+        if self.dictionary is not self._dictionary_ref:
+            # Dictionary was swapped out after init; rebuild the combined pattern
+            self._compile_dictionary()
+
+        if self._term_automaton is not None:
+            result, replacements_made = self._replace_with_automaton(text)
+        else:
+            lowered = text.lower()
+            pieces = []
+            last_end = 0
+            replacements_made = 0
+
+            for match in self._combined_re.finditer(lowered):
+                pieces.append(text[last_end:match.start()])
+                pieces.append(self._lower_map[match.group(0)])
+                last_end = match.end()
                 replacements_made += 1
-        
+
+            pieces.append(text[last_end:])
+            result = ''.join(pieces)
+
         logger.debug(f"Dictionary replacements made: {replacements_made}")
         return result
 
+@lru_cache(maxsize=8)
+def _combined_pattern(lowered_terms):
+    """Longest-first alternation over lowered keys, memoized per key set.
+
+    Built without re.IGNORECASE: the caller scans text.lower(), which
+    avoids the engine's Unicode case-folding per candidate match.
+    """
+    escaped_terms = sorted((re.escape(term) for term in lowered_terms), key=len, reverse=True)
+    return re.compile(r'\b(?:' + '|'.join(escaped_terms) + r')\b')
+
+@lru_cache(maxsize=8)
+def _phrase_pattern(phrases):
+    """Case-insensitive alternation over terms and replacements"""
+    escaped_phrases = sorted((re.escape(p) for p in phrases), key=len, reverse=True)
+    return re.compile(r'\b(?:' + '|'.join(escaped_phrases) + r')\b', re.IGNORECASE)
+
+@lru_cache(maxsize=4096)
+def _term_pattern(term):
+    """Compile (and cache) the whole-word pattern for a single term"""
+    return re.compile(r'\b' + re.escape(term) + r'\b', re.IGNORECASE)
+
 def get_simplification_mapping(text, simplified_text, dictionary):
     """Get mapping of original terms to simplified terms"""
+    processor = get_post_processor()
+    if dictionary is processor.dictionary:
+        if processor.dictionary is not processor._dictionary_ref:
+            processor._compile_dictionary()
+
+        if processor._combined_re is not None:
+            # Two alternation scans instead of two regex searches per term:
+            # collect every term hit in the source, every term/replacement
+            # hit in the output, then join them with set lookups
+            src_hits = {m.group(0) for m in processor._combined_re.finditer(text.lower())}
+            dst_hits = {m.group(0).lower() for m in processor._phrase_re.finditer(simplified_text)}
+
+            simplification_map = {}
+            for lowered_term in src_hits:
+                replacement = processor._lower_map[lowered_term]
+                if replacement.lower() in dst_hits or lowered_term not in dst_hits:
+                    simplification_map[processor._original_key[lowered_term]] = replacement
+            return simplification_map
+
     simplification_map = {}
-    
+
     for term, replacement in dictionary.items():
-        pattern = r'\b' + re.escape(term) + r'\b'
-        if re.search(pattern, text, re.IGNORECASE):
-            replacement_pattern = r'\b' + re.escape(replacement) + r'\b'
-            if re.search(replacement_pattern, simplified_text, re.IGNORECASE):
+        pattern = _term_pattern(term)
+        if pattern.search(text):
+            if _term_pattern(replacement).search(simplified_text):
                 simplification_map[term] = replacement
-            elif not re.search(pattern, simplified_text, re.IGNORECASE):
+            elif not pattern.search(simplified_text):
                 simplification_map[term] = replacement
-    
+
     return simplification_map
 
 def detect_recognized_terms(text, dictionary):
     """Detect recognized medical terms in text"""
+    processor = get_post_processor()
+    if dictionary is processor.dictionary:
+        # One automaton pass instead of a regex search per term
+        return processor.recognized_terms(text)
+
     recognized = []
     for term in dictionary.keys():
-        pattern = r'\b' + re.escape(term) + r'\b'
-        if re.search(pattern, text, re.IGNORECASE):
+        if _term_pattern(term).search(text):
             recognized.append(term)
     return recognized
 
-# Global instance
-post_processor = DictionaryPostProcessor()
\ No newline at end of file
+@cache
+def get_post_processor() -> DictionaryPostProcessor:
+    """Build the shared instance on first use instead of at import"""
+    return DictionaryPostProcessor()
+
+def __getattr__(name):
+    # Backward-compatible access for `from app.utils.post_processor import
+    # post_processor`; the instance is built lazily on first lookup
+    if name == 'post_processor':
+        return get_post_processor()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
\ No newline at end of file
@@ -1,23 +1,45 @@
 import re
 import ftfy
 
+# Compiled once at import so the hot path skips the re-cache lookup per call
+_RE_PUNCT_SPACE = re.compile(r'\s+([.,?!])')
+_RE_DUP_WORD = re.compile(r'\b(\w+)\s+\1\b', re.IGNORECASE)
+_RE_CAUSE_PREFIX = re.compile(r'^(bisa|dapat)?\s*(sebabkan|menyebabkan)\s*')
+# Characters typical of UTF-8-as-Latin-1 mojibake; clean decoder output
+# never contains them, so their absence lets us skip ftfy entirely
+_MOJIBAKE_HINTS = re.compile(r'[ÂÃâ€™â€œâ€�]')
+
 def final_cleanup(sentence: str) -> str:
-    cleaned_sentence = ftfy.fix_text(sentence)
-
-    for delimiter in [' dan ', ',']:
-        parts = cleaned_sentence.split(delimiter)
-        if len(parts) > 1:
-            last_part = parts[-1].lower()
-            previous_part = parts[-2].lower()
-
-            normalized_last = re.sub(r'^(bisa|dapat)?\s*(sebabkan|menyebabkan)\s*', '', last_part.strip()).rstrip('.,?!')
-            
-            if normalized_last and normalized_last in previous_part:
-                cleaned_sentence = delimiter.join(parts[:-1])
-
-    cleaned_sentence = re.sub(r'\s+([.,?!])', r'\1', cleaned_sentence)
-    
-    cleaned_sentence = re.sub(r'\b(\w+)\s+\1\b', r'\1', cleaned_sentence, flags=re.IGNORECASE)
+    # ftfy scans for encoding damage on every call; T5 output is almost
+    # always clean UTF-8, so only pay for it when a hint character shows up
+    cleaned_sentence = ftfy.fix_text(sentence) if _MOJIBAKE_HINTS.search(sentence) else sentence
+
+    for delimiter in (' dan ', ','):
+        # Only the last two segments matter, so rpartition twice instead of
+        # splitting the whole sentence and joining it back together
+        head, sep, last_part = cleaned_sentence.rpartition(delimiter)
+        if not sep:
+            continue
+
+        previous_part = head.rpartition(delimiter)[2].lower()
+        normalized_last = _RE_CAUSE_PREFIX.sub('', last_part.lower().strip()).rstrip('.,?!')
+
+        if normalized_last and normalized_last in previous_part:
+            cleaned_sentence = head
+
+    # Model output almost always has at most a single space before
+    # punctuation; str.replace is a C-level scan, much cheaper than the
+    # regex, which is kept for runs of whitespace
+    if '  ' in cleaned_sentence or '\t' in cleaned_sentence or '\n' in cleaned_sentence:
+        cleaned_sentence = _RE_PUNCT_SPACE.sub(r'\1', cleaned_sentence)
+    else:
+        cleaned_sentence = (cleaned_sentence
+                            .replace(' .', '.')
+                            .replace(' ,', ',')
+                            .replace(' ?', '?')
+                            .replace(' !', '!'))
+
+    cleaned_sentence = _RE_DUP_WORD.sub(r'\1', cleaned_sentence)
 
     if cleaned_sentence:
         cleaned_sentence = cleaned_sentence.lower().capitalize()
@@ -1,6 +1,5 @@
 import torch
 import os
-import sys
 from transformers import T5Tokenizer, T5ForConditionalGeneration
 import logging
 import time
@@ -8,18 +7,11 @@ from typing import Optional, Dict, Any
 from app.config import (
     MODEL_MAX_LENGTH, MODEL_MIN_LENGTH, MODEL_NUM_BEAMS,
     MODEL_REPETITION_PENALTY, MODEL_NO_REPEAT_NGRAM_SIZE,
-    MODEL_TEMPERATURE, MODEL_TOP_K, MODEL_TOP_P
+    MODEL_TEMPERATURE, MODEL_TOP_K, MODEL_TOP_P,
+    MODEL_INT8_QUANTIZATION
 )
 
-# Setup logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler(sys.stdout),
-        logging.FileHandler('medical_simplifier.log')
-    ]
-)
+# Konfigurasi logging dimiliki run.py; modul hanya mengambil logger-nya
 logger = logging.getLogger(__name__)
 
 class MedicalTextSimplifier:
@@ -41,8 +33,8 @@ class MedicalTextSimplifier:
             'length_penalty': 1.5,
             'no_repeat_ngram_size': MODEL_NO_REPEAT_NGRAM_SIZE, 
             'early_stopping': True,
-            'temperature': MODEL_TEMPERATURE,                  
-            'do_sample': False
+            'do_sample': False,
+            'use_cache': True
         }
     
     def _detect_compute_device(self) -> torch.device:
@@ -110,12 +102,13 @@ class MedicalTextSimplifier:
                 use_fast=True
             )
             
-            # Load model
+            # Load model (bf16 pada CUDA memangkas bandwidth bobot per token)
+            model_dtype = torch.bfloat16 if self.device.type == 'cuda' else torch.float32
             logger.info("Loading model...")
             self.model = T5ForConditionalGeneration.from_pretrained(
                 self.model_repo,
                 local_files_only=False,
-                torch_dtype=torch.float32
+                torch_dtype=model_dtype
             )
             
             # Pindahkan model ke device
@@ -124,7 +117,27 @@ class MedicalTextSimplifier:
             
             # Set model ke mode evaluasi
             self.model.eval()
-            
+
+            # Kuantisasi int8 dinamis pada CPU: linear fp32 mendominasi
+            # biaya decode, int8 memangkas komputasi dan memori bobot
+            if MODEL_INT8_QUANTIZATION and self.device.type == 'cpu':
+                try:
+                    params_before = sum(
+                        p.numel() * p.element_size() for p in self.model.parameters()
+                    )
+                    self.model = torch.quantization.quantize_dynamic(
+                        self.model, {torch.nn.Linear}, dtype=torch.qint8
+                    )
+                    params_after = sum(
+                        p.numel() * p.element_size() for p in self.model.parameters()
+                    )
+                    logger.info(
+                        f"Int8 dynamic quantization applied: parameter memory "
+                        f"{params_before / 1e6:.1f} MB -> {params_after / 1e6:.1f} MB"
+                    )
+                except Exception as quant_error:
+                    logger.warning(f"Int8 quantization skipped: {quant_error}")
+
             # Verifikasi komponen
             logger.info("Verifying model components...")
             if not self._verify_model_components():
@@ -137,7 +150,22 @@ class MedicalTextSimplifier:
             load_duration = self.load_end_time - self.load_start_time
             
             self.model_loaded = True
-            
+
+            # Warm-up: satu generate kecil supaya request pertama tidak
+            # membayar inisialisasi kernel/JIT
+            try:
+                if self.device.type == 'cuda':
+                    torch.backends.cudnn.benchmark = True
+                warmup_tokens = self.tokenizer(
+                    "sederhanakan: warmup",
+                    return_tensors="pt"
+                ).to(self.device)
+                with torch.inference_mode():
+                    self.model.generate(**warmup_tokens, max_new_tokens=8, num_beams=1)
+                logger.info("Warmup generation completed")
+            except Exception as warmup_error:
+                logger.warning(f"Warmup skipped: {warmup_error}")
+
             logger.info("=" * 60)
             logger.info("MODEL LOADING SUCCESSFUL")
             logger.info(f"Repository: {self.model_repo}")
@@ -204,16 +232,17 @@ class MedicalTextSimplifier:
             gen_config = self.generation_config.copy()
             gen_config.update(generation_kwargs)
             
-            # Generate output
-            with torch.no_grad():
+            # Generate output. Catatan: blok no_grad yang lama hanya
+            # membungkus timer, bukan panggilan generate-nya
+            with torch.inference_mode():
                 start_time = time.time()
-            
-            output_tokens = self.model.generate(
-                **input_tokens,
-                **gen_config
-            )
 
-            inference_time = time.time() - start_time
+                output_tokens = self.model.generate(
+                    **input_tokens,
+                    **gen_config
+                )
+
+                inference_time = time.time() - start_time
 
             try:
                 # Coba decode sebagai tensor biasa
@@ -1,6 +1,8 @@
 import os
+import queue
 import sys
 import logging
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from datetime import datetime
 
 # Add the app directory to Python path
@@ -10,25 +12,39 @@ from app import create_app
 from app.config import SERVER_HOST, SERVER_PORT, SERVER_DEBUG, LOG_LEVEL
 
 def setup_logging():
-    """Configure application logging"""
-    logging.basicConfig(
-        level=getattr(logging, LOG_LEVEL),
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        handlers=[
-            logging.StreamHandler(sys.stdout),
-            logging.FileHandler('logs/app.log')
-        ]
-    )
+    """Configure application logging.
+
+    Request threads only enqueue records; a QueueListener thread does the
+    actual stream/file writes so logging never blocks a request on I/O.
+    """
+    formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(formatter)
+    file_handler = RotatingFileHandler('logs/app.log', maxBytes=10 * 1024 * 1024, backupCount=3)
+    file_handler.setFormatter(formatter)
+
+    log_queue = queue.Queue(-1)
+    listener = QueueListener(log_queue, stream_handler, file_handler, respect_handler_level=True)
+    listener.start()
+
+    root_logger = logging.getLogger()
+    root_logger.setLevel(getattr(logging, LOG_LEVEL))
+    root_logger.handlers = [QueueHandler(log_queue)]
+
     return logging.getLogger(__name__)
 
 def check_system_status(logger):
     """Check and display system status"""
     try:
-        from app.utils.post_processor import post_processor
-        from app.models.text_simplifier import medical_text_simplifier
-        
-        dict_count = len(post_processor.dictionary)
-        model_loaded = medical_text_simplifier and medical_text_simplifier.model_loaded
+        from app.utils.post_processor import get_post_processor
+        from app.models import text_simplifier
+        from app.models.text_simplifier import get_simplifier
+
+        # First call in a fresh process warms both singletons
+        medical_text_simplifier = get_simplifier()
+        dict_count = get_post_processor().dictionary_count
+        model_loaded = text_simplifier.MODEL_READY
         
         logger.info("SYSTEM STATUS CHECK")
         logger.info("========================================================================")
@@ -51,14 +67,19 @@ def check_system_status(logger):
         return False, 0
 
 def main():
-    """Main application entry point"""
+    """Main application entry point.
+
+    Development only: app.run uses the single-threaded Werkzeug server.
+    In production run one threaded gunicorn worker instead, e.g.
+    gunicorn -w 1 --threads 8 -k gthread "app:create_app()" (see Dockerfile).
+    """
     try:
-        # Setup logging
-        logger = setup_logging()
-        
-        # Check requirements
+        # Check requirements (log directory must exist before the handler opens)
         os.makedirs('logs', exist_ok=True)
         os.makedirs('data', exist_ok=True)
+
+        # Setup logging
+        logger = setup_logging()
         
         # Create Flask application
         app = create_app()
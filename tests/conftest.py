@@ -0,0 +1,13 @@
+import pytest
+from app.models.text_simplifier import MedicalTextSimplifier
+
+@pytest.fixture(scope="session")
+def loaded_simplifier():
+    """Load the real model once for the whole test session.
+
+    Integration tests share this instance; the model load dominates the
+    suite's runtime, so a per-test reload would dwarf everything else.
+    """
+    simplifier = MedicalTextSimplifier()
+    simplifier.load_model()
+    yield simplifier
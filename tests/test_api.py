@@ -1,193 +1,121 @@
 import pytest
-import json
 from unittest.mock import patch, MagicMock
 from app import create_app
 from app.utils.error_handler import ValidationError, MedicalTermError
 
-@pytest.fixture
+# Allocated once at import; exceeds MAX_TEXT_LENGTH
+_LONG_TEXT = 'a' * 2001
+
+# Session scope: tests only patch module-level objects, never mutate app
+# state, so one create_app() can serve the whole file
+@pytest.fixture(scope="session")
 def app():
     """Create and configure a Flask app for testing"""
     app = create_app()
     app.config['TESTING'] = True
-    
+
     yield app
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def client(app):
     """Test client for the app"""
     return app.test_client()
 
 class TestSimplifyAPI:
     """Test cases for /simplify endpoint"""
-    
-    def test_simplify_success(self, client):
+
+    @pytest.fixture(autouse=True)
+    def mocks(self):
+        """Patch the module-level model and post-processor once per test"""
+        with patch('app.routes.api.medical_text_simplifier') as mock_model, \
+             patch('app.routes.api.post_processor') as mock_processor:
+            yield mock_model, mock_processor
+
+    def test_simplify_success(self, client, mocks):
         """Test successful text simplification"""
         test_data = {
             'text': 'Pasien mengalami hipertensi dan diabetes mellitus tipe 2'
         }
-        
-        # Mock the model and post-processor
-        with patch('app.routes.api.medical_text_simplifier') as mock_model, \
-             patch('app.routes.api.post_processor') as mock_processor:
-            
-            # Setup mocks
-            mock_model.model_loaded = True
-            mock_model.simplify_medical_text.return_value = 'Pasien memiliki tekanan darah tinggi dan penyakit gula tipe 2'
-            mock_processor.dictionary = {
-                'hipertensi': 'tekanan darah tinggi',
-                'diabetes mellitus tipe 2': 'penyakit gula tipe 2'
-            }
-            mock_processor.post_process.return_value = 'Pasien memiliki tekanan darah tinggi dan penyakit gula tipe 2'
-            
-            response = client.post(
-                '/simplify',
-                data=json.dumps(test_data),
-                content_type='application/json'
-            )
-            
-            assert response.status_code == 200
-            data = json.loads(response.data)
-            assert data['status'] == 'success'
-            assert 'tekanan darah tinggi' in data['data']['simplified_text']
-    
-    def test_simplify_no_medical_terms(self, client):
+
+        mock_model, mock_processor = mocks
+        mock_model.model_loaded = True
+        mock_model.simplify_medical_text.return_value = 'Pasien memiliki tekanan darah tinggi dan penyakit gula tipe 2'
+        mock_processor.dictionary = {
+            'hipertensi': 'tekanan darah tinggi',
+            'diabetes mellitus tipe 2': 'penyakit gula tipe 2'
+        }
+        mock_processor.post_process.return_value = 'Pasien memiliki tekanan darah tinggi dan penyakit gula tipe 2'
+
+        response = client.post('/simplify', json=test_data)
+
+        assert response.status_code == 200
+        data = response.get_json()
+        assert data['status'] == 'success'
+        assert 'tekanan darah tinggi' in data['data']['simplified_text']
+
+    def test_simplify_no_medical_terms(self, client, mocks):
         """Test text with no medical terms"""
         test_data = {
             'text': 'Hari ini cuaca sangat cerah dan indah'
         }
-        
-        with patch('app.routes.api.post_processor') as mock_processor:
-            mock_processor.dictionary = {
-                'hipertensi': 'tekanan darah tinggi'
-            }
-            
-            response = client.post(
-                '/simplify',
-                data=json.dumps(test_data),
-                content_type='application/json'
-            )
-            
-            assert response.status_code == 400
-            data = json.loads(response.data)
-            assert data['status'] == 'error'
-            assert data['error']['code'] == 'NO_MEDICAL_TERMS'
-    
-    def test_simplify_empty_text(self, client):
-        """Test with empty text"""
-        test_data = {
-            'text': ''
+
+        _mock_model, mock_processor = mocks
+        mock_processor.dictionary = {
+            'hipertensi': 'tekanan darah tinggi'
         }
-        
-        response = client.post(
-            '/simplify',
-            data=json.dumps(test_data),
-            content_type='application/json'
-        )
-        
+
+        response = client.post('/simplify', json=test_data)
+
         assert response.status_code == 400
-        data = json.loads(response.data)
-        assert data['error']['code'] == 'VALIDATION_ERROR'
-    
-    def test_simplify_text_too_long(self, client):
-        """Test with text exceeding length limit"""
-        long_text = 'a' * 2001  # Exceeds MAX_TEXT_LENGTH
-        
-        test_data = {
-            'text': long_text
-        }
-        
-        response = client.post(
-            '/simplify',
-            data=json.dumps(test_data),
-            content_type='application/json'
-        )
-        
+        data = response.get_json()
+        assert data['status'] == 'error'
+        assert data['error']['code'] == 'NO_MEDICAL_TERMS'
+
+    @pytest.mark.parametrize("text", ['', _LONG_TEXT], ids=['empty', 'too-long'])
+    def test_simplify_validation_errors(self, client, text):
+        """Empty and over-limit inputs both fail validation"""
+        response = client.post('/simplify', json={'text': text})
+
         assert response.status_code == 400
-        data = json.loads(response.data)
+        data = response.get_json()
         assert data['error']['code'] == 'VALIDATION_ERROR'
-    
-    def test_simplify_model_not_loaded(self, client):
+
+    def test_simplify_model_not_loaded(self, client, mocks):
         """Test when model is not loaded"""
         test_data = {
             'text': 'Pasien dengan hipertensi'
         }
-        
-        with patch('app.routes.api.medical_text_simplifier') as mock_model, \
-             patch('app.routes.api.post_processor') as mock_processor:
-            
-            mock_model.model_loaded = False
-            mock_processor.dictionary = {'hipertensi': 'tekanan darah tinggi'}
-            
-            response = client.post(
-                '/simplify',
-                data=json.dumps(test_data),
-                content_type='application/json'
-            )
-            
-            assert response.status_code == 503
-            data = json.loads(response.data)
-            assert data['error']['code'] == 'MODEL_ERROR'
+
+        mock_model, mock_processor = mocks
+        mock_model.model_loaded = False
+        mock_processor.dictionary = {'hipertensi': 'tekanan darah tinggi'}
+
+        response = client.post('/simplify', json=test_data)
+
+        assert response.status_code == 503
+        data = response.get_json()
+        assert data['error']['code'] == 'MODEL_ERROR'
 
 class TestValidateTextAPI:
     """Test cases for /validate-text endpoint"""
     
-    def test_validate_medical_text(self, client):
-        """Test validation with medical text"""
-        test_data = {
-            'text': 'Pasien mengalami hipertensi'
-        }
-        
-        with patch('app.routes.api.post_processor') as mock_processor:
-            mock_processor.dictionary = {
-                'hipertensi': 'tekanan darah tinggi'
-            }
-            
-            response = client.post(
-                '/validate-text',
-                data=json.dumps(test_data),
-                content_type='application/json'
-            )
-            
-            assert response.status_code == 200
-            data = json.loads(response.data)
-            assert data['data']['is_medical'] == True
-    
-    def test_validate_non_medical_text(self, client):
-        """Test validation with non-medical text"""
-        test_data = {
-            'text': 'Hari ini cuaca sangat cerah'
-        }
-        
+    @pytest.mark.parametrize("text,is_medical", [
+        ('Pasien mengalami hipertensi', True),
+        ('Hari ini cuaca sangat cerah', False),
+        ('', False),
+    ], ids=['medical', 'non-medical', 'empty'])
+    def test_validate_text(self, client, text, is_medical):
+        """Validation flags medical terms and tolerates empty input"""
         with patch('app.routes.api.post_processor') as mock_processor:
             mock_processor.dictionary = {
                 'hipertensi': 'tekanan darah tinggi'
             }
-            
-            response = client.post(
-                '/validate-text',
-                data=json.dumps(test_data),
-                content_type='application/json'
-            )
-            
+
+            response = client.post('/validate-text', json={'text': text})
+
             assert response.status_code == 200
-            data = json.loads(response.data)
-            assert data['data']['is_medical'] == False
-    
-    def test_validate_empty_text(self, client):
-        """Test validation with empty text"""
-        test_data = {
-            'text': ''
-        }
-        
-        response = client.post(
-            '/validate-text',
-            data=json.dumps(test_data),
-            content_type='application/json'
-        )
-        
-        assert response.status_code == 200
-        data = json.loads(response.data)
-        assert data['data']['is_medical'] == False
+            data = response.get_json()
+            assert data['data']['is_medical'] == is_medical
 
 class TestHealthAPI:
     """Test cases for health check endpoints"""
@@ -205,7 +133,7 @@ class TestHealthAPI:
             response = client.get('/health')
             
             assert response.status_code == 200
-            data = json.loads(response.data)
+            data = response.get_json()
             assert 'status' in data
     
     def test_system_status(self, client):
@@ -220,7 +148,7 @@ class TestHealthAPI:
             response = client.get('/system-status')
             
             assert response.status_code == 200
-            data = json.loads(response.data)
+            data = response.get_json()
             assert data['application'] == 'Medical Text Simplification API'
 
 class TestErrorHandling:
@@ -231,7 +159,7 @@ class TestErrorHandling:
         response = client.get('/nonexistent-endpoint')
         
         assert response.status_code == 404
-        data = json.loads(response.data)
+        data = response.get_json()
         assert data['status'] == 'error'
     
     def test_method_not_allowed(self, client):
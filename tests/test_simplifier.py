@@ -1,7 +1,6 @@
 import pytest
-import pandas as pd
+from types import SimpleNamespace
 from unittest.mock import patch, MagicMock
-import torch
 from app.models.text_simplifier import MedicalTextSimplifier
 from app.utils.post_processor import DictionaryPostProcessor, get_simplification_mapping, detect_recognized_terms
 from app.utils.text_cleaner import final_cleanup
@@ -9,10 +8,13 @@ from app.utils.text_cleaner import final_cleanup
 class TestMedicalTextSimplifier:
     """Test cases for MedicalTextSimplifier class"""
     
-    @pytest.fixture
+    # Class scope: one instance for the whole class; test_init runs first
+    # (pytest keeps definition order) so it still sees the fresh state,
+    # and later tests reset the flags they depend on
+    @pytest.fixture(scope="class")
     def simplifier(self):
         return MedicalTextSimplifier(model_repo="test/model")
-    
+
     def test_init(self, simplifier):
         assert simplifier.model_repo == "test/model"
         assert simplifier.model_loaded == False
@@ -24,16 +26,23 @@ class TestMedicalTextSimplifier:
     @patch('app.models.text_simplifier.torch')
     def test_load_model_success(self, mock_torch, mock_model_class, mock_tokenizer_class, simplifier):
         mock_torch.cuda.is_available.return_value = False
-        mock_torch.device.return_value = 'cpu'
-        
-        mock_tokenizer = MagicMock()
-        mock_tokenizer_class.from_pretrained.return_value = mock_tokenizer
-        
-        mock_model = MagicMock()
-        mock_model_class.from_pretrained.return_value = mock_model
+        mock_torch.backends.mps.is_available.return_value = False
+        mock_torch.device.return_value = SimpleNamespace(type='cpu')
+        # Quantization must hand back the same object so identity survives
+        mock_torch.quantization.quantize_dynamic.side_effect = lambda model, layers, dtype: model
+
+        # SimpleNamespace stubs: only from_pretrained needs call tracking,
+        # the recursive MagicMock tree is wasted work here
+        mock_tokenizer = SimpleNamespace()
+        mock_tokenizer_class.from_pretrained = MagicMock(return_value=mock_tokenizer)
+
+        mock_model = SimpleNamespace()
+        mock_model.to = lambda device: mock_model
+        mock_model.eval = lambda: mock_model
+        mock_model_class.from_pretrained = MagicMock(return_value=mock_model)
 
         result = simplifier.load_model()
-        
+
         assert result == True
         assert simplifier.model_loaded == True
         assert simplifier.tokenizer == mock_tokenizer
@@ -42,8 +51,9 @@ class TestMedicalTextSimplifier:
     @patch('app.models.text_simplifier.T5Tokenizer')
     def test_load_model_failure(self, mock_tokenizer_class, simplifier):
         """Test model loading failure"""
+        simplifier.model_loaded = False
         mock_tokenizer_class.from_pretrained.side_effect = Exception("Download failed")
-        
+
         result = simplifier.load_model()
         
         assert result == False
@@ -81,17 +91,27 @@ class TestMedicalTextSimplifier:
 
 class TestDictionaryPostProcessor:
     """Test cases for DictionaryPostProcessor"""
-    
-    @pytest.fixture
-    def sample_dictionary_csv(self, tmp_path):
-        """Create a sample dictionary CSV file for testing"""
-        dictionary_data = {
-            'term': ['hipertensi', 'diabetes mellitus', 'infark miokard'],
-            'simplified': ['tekanan darah tinggi', 'penyakit gula', 'serangan jantung']
-        }
-        df = pd.DataFrame(dictionary_data)
-        csv_path = tmp_path / "test_dictionary.csv"
-        df.to_csv(csv_path, index=False)
+
+    # Shared dictionary object: post_process only recompiles its combined
+    # pattern when the dictionary identity changes, so tests reusing this
+    # exact dict hit the cached compilation
+    HIPERTENSI_DICT = {'hipertensi': 'tekanan darah tinggi'}
+
+    @pytest.fixture(scope="class")
+    def processor(self):
+        """One processor for the class; tests swap .dictionary as needed"""
+        return DictionaryPostProcessor()
+
+    @pytest.fixture(scope="session")
+    def sample_dictionary_csv(self, tmp_path_factory):
+        """Create a sample dictionary CSV file once for the whole session"""
+        csv_path = tmp_path_factory.mktemp("dict") / "test_dictionary.csv"
+        csv_path.write_text(
+            "term,simplified\n"
+            "hipertensi,tekanan darah tinggi\n"
+            "diabetes mellitus,penyakit gula\n"
+            "infark miokard,serangan jantung\n"
+        )
         return str(csv_path)
     
     def test_load_dictionary_success(self, sample_dictionary_csv):
@@ -108,42 +128,35 @@ class TestDictionaryPostProcessor:
         
         assert processor.dictionary == {}
     
-    def test_post_process_with_replacements(self):
+    def test_post_process_with_replacements(self, processor):
         """Test post-processing with term replacements"""
-        processor = DictionaryPostProcessor()
         processor.dictionary = {
             'hipertensi': 'tekanan darah tinggi',
             'diabetes': 'penyakit gula'
         }
-        
+
         input_text = "Pasien dengan hipertensi dan diabetes"
         result = processor.post_process(input_text)
-        
+
         assert "tekanan darah tinggi" in result
         assert "penyakit gula" in result
-    
-    def test_post_process_no_replacements(self):
+
+    def test_post_process_no_replacements(self, processor):
         """Test post-processing with no matching terms"""
-        processor = DictionaryPostProcessor()
-        processor.dictionary = {
-            'hipertensi': 'tekanan darah tinggi'
-        }
-        
+        processor.dictionary = self.HIPERTENSI_DICT
+
         input_text = "Pasien dengan flu biasa"
         result = processor.post_process(input_text)
-        
+
         assert result == input_text
-    
-    def test_post_process_case_insensitive(self):
+
+    def test_post_process_case_insensitive(self, processor):
         """Test case-insensitive term replacement"""
-        processor = DictionaryPostProcessor()
-        processor.dictionary = {
-            'hipertensi': 'tekanan darah tinggi'
-        }
-        
+        processor.dictionary = self.HIPERTENSI_DICT
+
         input_text = "Pasien dengan HIPERTENSI"
         result = processor.post_process(input_text)
-        
+
         assert "tekanan darah tinggi" in result
 
 class TestSimplificationMapping:
@@ -226,8 +239,12 @@ class TestTextCleaner:
 class TestIntegration:
     """Integration tests for the complete pipeline"""
     
-    def test_complete_pipeline(self):
+    def test_complete_pipeline(self, loaded_simplifier):
         """Test the complete text simplification pipeline"""
-        # This would be a more complex integration test
-        # For now, we'll test the coordination between components
-        pass
\ No newline at end of file
+        if not loaded_simplifier.model_loaded:
+            pytest.skip("Model weights unavailable (offline environment)")
+
+        simplified = loaded_simplifier.simplify_medical_text("Pasien menderita hipertensi")
+
+        assert isinstance(simplified, str)
+        assert simplified.strip()
\ No newline at end of file